@@ -0,0 +1,32 @@
+import json
+
+import fire
+from lib import position_index
+from lib.games.tictactoe.spec import TicTacToeGameSpec
+
+
+def backfill(limit: int = 1000) -> int:
+    """Index finished tic-tac-toe matches that are missing from the position index.
+
+    Args:
+        limit: Maximum number of matches to index in this run
+    """
+    return position_index.backfill(TicTacToeGameSpec(), limit=limit)
+
+
+def lookup(board: str, player: str = "agentA", agent: str | None = None) -> str:
+    """Show move statistics for a position across all its symmetric variants.
+
+    Args:
+        board: Nine cells row by row, using X, O and '.' for empty (e.g. "X...O....")
+        player: Side to move
+        agent: Restrict to one agent name
+    """
+    spec = TicTacToeGameSpec()
+    cells = [" " if ch == "." else ch for ch in board]
+    state = spec.state_model(board=[cells[i : i + 3] for i in range(0, 9, 3)], player=player)
+    return json.dumps(position_index.lookup(spec, state, agent_name=agent), indent=2)
+
+
+if __name__ == "__main__":
+    fire.Fire({"backfill": backfill, "lookup": lookup})
@@ -0,0 +1,75 @@
+import json
+
+import fire
+from lib.games.tictactoe.agents import LLMAgent
+from lib.games.tictactoe.spec import TicTacToeGameSpec
+from lib.loadtest import BehaviourModel, FakeOpenRouterServer, LatencyModel, SyntheticAgent, run_load_test
+from lib.openrouter import OpenRouter
+from lib.orchestrator import run_match
+
+
+def main(
+    matches: int = 50,
+    concurrency: int = 8,
+    mode: str = "synthetic",
+    latency_ms: float = 800.0,
+    sigma: float = 0.5,
+    error_rate: float = 0.0,
+    illegal_rate: float = 0.0,
+    response_bytes: int = 200,
+    speculate: int = 0,
+    turns: int = 9,
+) -> str:
+    """Drive matches against DATABASE_URL at a target concurrency and report throughput.
+
+    Args:
+        matches: Number of matches to play
+        concurrency: Matches in flight at once
+        mode: "synthetic" for in-process agents, "openrouter" for LLM agents talking to a local fake server
+        latency_ms: Median response latency
+        sigma: Log-normal spread of the latency
+        error_rate: Probability that a response fails
+        illegal_rate: Probability that a move targets an occupied cell
+        response_bytes: Size of each synthetic response body
+        speculate: Speculative prefetches per opponent turn (openrouter mode)
+        turns: Max turns per match
+    """
+    behaviour = BehaviourModel(
+        latency=LatencyModel(median_ms=latency_ms, sigma=sigma),
+        error_rate=error_rate,
+        illegal_rate=illegal_rate,
+        response_bytes=response_bytes,
+    )
+    spec = TicTacToeGameSpec()
+
+    def play(agent_a, agent_b):
+        return run_match(agent_a, agent_b, max_turns=turns, game=spec)
+
+    if mode == "synthetic":
+        def make_agents(i: int):
+            return (
+                SyntheticAgent("synthetic-a", behaviour, seed=f"{i}-a"),
+                SyntheticAgent("synthetic-b", behaviour, seed=f"{i}-b"),
+            )
+
+        report = run_load_test(make_agents, play, matches=matches, concurrency=concurrency)
+    elif mode == "openrouter":
+        with FakeOpenRouterServer(behaviour) as server:
+            # No client retries: synthetic failures should reach the engine and not inflate latencies
+            client = OpenRouter(base_url=server.base_url, api_key="fake", max_retries=0)
+
+            def make_agents(i: int):
+                return (
+                    LLMAgent("fake-llm-a", model="fake/a", client=client, speculate=speculate),
+                    LLMAgent("fake-llm-b", model="fake/b", client=client, speculate=speculate),
+                )
+
+            report = run_load_test(make_agents, play, matches=matches, concurrency=concurrency)
+            report["llm_requests"] = server.requests
+    else:
+        raise ValueError("mode must be 'synthetic' or 'openrouter'")
+    return json.dumps(report, indent=2)
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
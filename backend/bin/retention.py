@@ -0,0 +1,37 @@
+import json
+
+import fire
+from lib import retention
+
+
+def run(
+    policies: dict | None = None,
+    months_ahead: int = 2,
+    compact_after_days: int | None = 30,
+    drop_after_days: int | None = None,
+) -> str:
+    """Create upcoming partitions, then drop and compact history according to retention policies.
+
+    Args:
+        policies: Per-game overrides, e.g. {"tictactoe": {"compact_after_days": 7, "drop_after_days": 365}}
+        months_ahead: Monthly partitions to create beyond the current month
+        compact_after_days: Default compaction age for games without an override
+        drop_after_days: Default deletion age for games without an override (None keeps forever)
+    """
+    default = retention.RetentionPolicy(compact_after_days=compact_after_days, drop_after_days=drop_after_days)
+    per_game = {key: retention.RetentionPolicy(**value) for key, value in (policies or {}).items()}
+    report = retention.apply_retention(per_game, default=default, months_ahead=months_ahead)
+    return json.dumps(report, indent=2, default=str)
+
+
+def partitions(months_ahead: int = 2) -> list[str]:
+    """Only create upcoming monthly partitions.
+
+    Args:
+        months_ahead: Monthly partitions to create beyond the current month
+    """
+    return retention.ensure_partitions(months_ahead)
+
+
+if __name__ == "__main__":
+    fire.Fire({"run": run, "partitions": partitions})
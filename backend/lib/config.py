@@ -11,6 +11,7 @@ def safe_load_env(key: str) -> str:
 
 # Optional for MVP (OpenRouter is out of scope). Keep lazy access for later use.
 OPEN_ROUTER_API_KEY = os.environ.get("OPEN_ROUTER_API_KEY")
+OPEN_ROUTER_BASE_URL = os.environ.get("OPEN_ROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Required for DB access
 DATABASE_URL = safe_load_env("DATABASE_URL")
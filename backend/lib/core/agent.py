@@ -1,4 +1,4 @@
-from typing import Protocol, TypeVar, Generic
+from typing import Any, Protocol, TypeVar, Generic
 from pydantic import BaseModel
 from .types import Event
 
@@ -14,4 +14,10 @@ class Agent(Generic[ActionT, ObservationT], Protocol):
 
     def receive_outcome(self, event: Event) -> None: ...
 
+    # Called (non-blocking) with this agent's view of the position while the opponent is thinking
+    def observe_opponent_turn(self, turn_index: int, observation: ObservationT) -> None: ...
+
+    # Identity and config of a deterministic agent for outcome caching; None means "not reproducible"
+    def fingerprint(self) -> dict[str, Any] | None: ...
+
 
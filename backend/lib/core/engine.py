@@ -28,9 +28,10 @@ class Engine:
         agent_b: Agent,
         game: GameSpec[StateT, ActionT, ObservationT],
         max_turns: int = 6,
+        seed: str | None = None,
     ) -> Dict[str, Any]:
-        seed = generate_seed()
-        match_id = self._initialize_match(seed, game)
+        seed = seed or generate_seed()
+        match_id = self._initialize_match(seed, game, agent_a, agent_b)
         state = self._setup_initial_state(match_id, game, seed)
 
         try:
@@ -40,7 +41,13 @@ class Engine:
             self._handle_match_error(match_id, exc)
             raise
 
-    def _initialize_match(self, seed: str, game: GameSpec[StateT, ActionT, ObservationT]) -> int:
+    def _initialize_match(
+        self,
+        seed: str,
+        game: GameSpec[StateT, ActionT, ObservationT],
+        agent_a: Agent,
+        agent_b: Agent,
+    ) -> int:
         logger.info(
             f"engine.match_started seed={seed} game_key={game.game_key} version={game.game_version}"
         )
@@ -48,6 +55,8 @@ class Engine:
             seed=seed,
             game_key=game.game_key,
             game_version=game.game_version,
+            agent_a=agent_a.name,
+            agent_b=agent_b.name,
         )
         persistence.record_event(
             match_id,
@@ -84,6 +93,8 @@ class Engine:
             persistence.record_event(match_id, "engine.turn_started", {"turn": turn_idx, "actor": actor})
 
             acting_agent = agent_a if actor == "agentA" else agent_b
+            waiting_agent = agent_b if actor == "agentA" else agent_a
+            self._notify_waiting_agent(waiting_agent, turn_idx, game, state, actor)
             action = self._get_agent_action(acting_agent, turn_idx, game, state, actor)
 
             # Handle illegal actions
@@ -116,6 +127,23 @@ class Engine:
         logger.debug(f"engine.agent_action actor={actor} action={action.model_dump_json()}")
         return action
 
+    def _notify_waiting_agent(
+        self,
+        waiting_agent: Agent,
+        turn_idx: int,
+        game: GameSpec[StateT, ActionT, ObservationT],
+        state: StateT,
+        actor: str,
+    ) -> None:
+        hook = getattr(waiting_agent, "observe_opponent_turn", None)
+        if hook is None:
+            return
+        waiting_actor = "agentB" if actor == "agentA" else "agentA"
+        try:
+            hook(turn_idx, game.observation_for(state, waiting_actor))
+        except Exception:
+            logger.exception(f"{waiting_actor}.observe_opponent_turn error")
+
     def _try_apply_action(
         self,
         match_id: int,
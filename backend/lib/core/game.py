@@ -26,6 +26,9 @@ class GameSpec(Generic[StateT, ActionT, ObservationT], Protocol):
 
     def apply_action(self, state: StateT, action: ActionT) -> TransitionResult[StateT]: ...
 
+    # Enumerate the actions the current actor may take; used by search-based agents
+    def legal_actions(self, state: StateT) -> list[ActionT]: ...
+
     def is_terminal(self, state: StateT) -> bool: ...
 
     def score(self, state: StateT) -> dict[str, float]: ...
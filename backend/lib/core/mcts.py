@@ -0,0 +1,291 @@
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+from loguru import logger
+
+from pydantic import BaseModel
+from lib.core.agent import Agent
+from .game import GameSpec
+from .types import Event
+
+
+StateT = TypeVar("StateT", bound=BaseModel)
+ActionT = TypeVar("ActionT", bound=BaseModel)
+ObservationT = TypeVar("ObservationT", bound=BaseModel)
+
+
+def _state_key(state: BaseModel) -> str:
+    return json.dumps(state.model_dump(), sort_keys=True)
+
+
+def _rollout(game: GameSpec, state: BaseModel, seed: int, max_depth: int) -> Dict[str, float]:
+    """Play uniformly random legal moves until the game ends; runs inside pool workers."""
+    rng = random.Random(seed)
+    for _ in range(max_depth):
+        if game.is_terminal(state):
+            return game.score(state)
+        actions = game.legal_actions(state)
+        if not actions:
+            break
+        state = game.apply_action(state, rng.choice(actions)).state_after
+    return game.score(state) if game.is_terminal(state) else {}
+
+
+# Set once per pool worker so tasks only carry states and seeds, not the game spec
+_worker_game: GameSpec | None = None
+
+
+def _init_worker(game: GameSpec) -> None:
+    global _worker_game
+    _worker_game = game
+
+
+def _rollout_chunk(jobs: list[tuple[BaseModel, int]], max_depth: int) -> list[Dict[str, float]]:
+    return [_rollout(_worker_game, state, seed, max_depth) for state, seed in jobs]
+
+
+class _Node:
+    __slots__ = ("state", "parent", "action", "mover", "children", "untried", "visits", "value", "terminal")
+
+    def __init__(
+        self,
+        game: GameSpec,
+        state: BaseModel,
+        *,
+        parent: Optional["_Node"] = None,
+        action: Optional[BaseModel] = None,
+        mover: Optional[str] = None,
+    ) -> None:
+        self.state = state
+        self.parent = parent
+        self.action = action
+        # Actor whose move led into this node; rewards are accumulated from their side
+        self.mover = mover
+        self.children: Dict[str, _Node] = {}
+        self.terminal = game.is_terminal(state)
+        self.untried = [] if self.terminal else list(game.legal_actions(state))
+        self.visits = 0
+        self.value = 0.0
+
+
+class _Batch:
+    __slots__ = ("leaves", "results", "futures")
+
+    def __init__(self, leaves: list[_Node], results: list, futures: list) -> None:
+        self.leaves = leaves
+        self.results = results
+        self.futures = futures
+
+
+class MCTSAgent(Agent[ActionT, ObservationT], Generic[StateT, ActionT, ObservationT]):
+    """Game-agnostic UCT agent.
+
+    The search tree survives between ``produce_action`` calls: after the opponent
+    replies, the matching grandchild of the previous root becomes the new root.
+    With ``workers > 1`` each batch selects ``workers * rollouts_per_task`` leaves
+    (virtual visits keep them from piling onto the same one) and hands every worker
+    one chunk, so IPC is paid per chunk rather than per rollout; the next batch is
+    selected while the current one rolls out. The pool outlives
+    individual matches; call ``close()`` when the agent is no longer needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        game: GameSpec[StateT, ActionT, ObservationT],
+        *,
+        state_from_observation: Callable[[ObservationT], StateT],
+        iterations: int | None = 1000,
+        time_limit: float | None = None,
+        workers: int = 1,
+        rollouts_per_task: int = 64,
+        exploration: float = math.sqrt(2),
+        max_rollout_depth: int = 1000,
+        seed: str | None = None,
+    ) -> None:
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration or time budget")
+        if iterations is not None and iterations < 1:
+            raise ValueError("MCTSAgent iterations must be at least 1")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("MCTSAgent time_limit must be positive")
+        self.name = name
+        self.game = game
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = max(1, workers)
+        self.rollouts_per_task = max(1, rollouts_per_task)
+        self.exploration = exploration
+        self.max_rollout_depth = max_rollout_depth
+        self._state_from_observation = state_from_observation
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._played = False
+        self._root: _Node | None = None
+        self._pool: Executor | None = None
+
+    def produce_action(self, turn_index: int, observation: ObservationT) -> ActionT:
+        self._played = True
+        state = self._state_from_observation(observation)
+        root = self._reuse_or_create_root(state)
+        if not root.untried and not root.children:
+            raise ValueError("No legal actions available")
+
+        iterations = self._search(root)
+        best = max(root.children.values(), key=lambda child: child.visits)
+        logger.debug(
+            f"mcts.search agent={self.name} turn={turn_index} iterations={iterations} "
+            f"root_visits={root.visits} best_visits={best.visits}"
+        )
+        # Keep the chosen subtree; the opponent's reply will be looked up beneath it
+        best.parent = None
+        self._root = best
+        return best.action
+
+    def receive_outcome(self, event: Event) -> None:
+        # Drop the tree but keep the pool warm for the next match
+        self._root = None
+
+    def fingerprint(self) -> Dict[str, Any] | None:
+        # Wall-clock budgets make the search depth, and so the moves, machine dependent
+        if self.seed is None or self.time_limit is not None or self._played:
+            return None
+        return {
+            "type": self.__class__.__name__,
+            "game_key": self.game.game_key,
+            "game_version": self.game.game_version,
+            "seed": self.seed,
+            "iterations": self.iterations,
+            # Batch size changes which leaves are selected before results come back
+            "workers": self.workers,
+            "rollouts_per_task": self.rollouts_per_task,
+            "exploration": self.exploration,
+            "max_rollout_depth": self.max_rollout_depth,
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _reuse_or_create_root(self, state: StateT) -> _Node:
+        key = _state_key(state)
+        if self._root is not None:
+            # Our previous move is the old root; the position we face is at most two plies below it
+            frontier = [self._root]
+            for _ in range(3):
+                for node in frontier:
+                    if _state_key(node.state) == key:
+                        node.parent = None
+                        self._root = node
+                        return node
+                frontier = [child for node in frontier for child in node.children.values()]
+        self._root = _Node(self.game, state)
+        return self._root
+
+    def _search(self, root: _Node) -> int:
+        deadline = time.monotonic() + self.time_limit if self.time_limit is not None else None
+        batch_size = self.workers * self.rollouts_per_task if self.workers > 1 else 1
+        done = 0
+        # With a pool, the next batch is selected while the previous one is still rolling out
+        in_flight: _Batch | None = None
+        while True:
+            if self.iterations is not None and done >= self.iterations:
+                break
+            # Always run at least one batch so there is a move to return
+            if deadline is not None and done and time.monotonic() >= deadline:
+                break
+            size = batch_size if self.iterations is None else min(batch_size, self.iterations - done)
+            batch = self._start_batch(root, size)
+            if in_flight is not None:
+                self._finish_batch(in_flight)
+            in_flight = batch
+            done += size
+        if in_flight is not None:
+            self._finish_batch(in_flight)
+        return done
+
+    def _start_batch(self, root: _Node, size: int) -> "_Batch":
+        leaves = [self._select_and_expand(root) for _ in range(size)]
+        seeds = [self._rng.getrandbits(32) for _ in leaves]
+        if self.workers == 1:
+            results = [_rollout(self.game, leaf.state, seed, self.max_rollout_depth) for leaf, seed in zip(leaves, seeds)]
+            return _Batch(leaves, results, [])
+        results: list[Dict[str, float] | None] = [
+            self.game.score(leaf.state) if leaf.terminal else None for leaf in leaves
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        chunk = max(1, -(-len(pending) // self.workers))
+        pool = self._get_pool()
+        futures = [
+            (
+                indices,
+                pool.submit(_rollout_chunk, [(leaves[i].state, seeds[i]) for i in indices], self.max_rollout_depth),
+            )
+            for indices in (pending[start : start + chunk] for start in range(0, len(pending), chunk))
+        ]
+        return _Batch(leaves, results, futures)
+
+    def _finish_batch(self, batch: "_Batch") -> None:
+        for indices, future in batch.futures:
+            for i, scores in zip(indices, future.result()):
+                batch.results[i] = scores
+        # Backpropagate in selection order so seeded searches stay reproducible
+        for leaf, scores in zip(batch.leaves, batch.results):
+            self._backpropagate(leaf, scores or {})
+
+    def _select_and_expand(self, root: _Node) -> _Node:
+        node = root
+        node.visits += 1
+        while not node.terminal:
+            if node.untried:
+                action = node.untried.pop(self._rng.randrange(len(node.untried)))
+                mover = self.game.current_actor(node.state)
+                child_state = self.game.apply_action(node.state, action).state_after
+                child = _Node(self.game, child_state, parent=node, action=action, mover=mover)
+                node.children[action.model_dump_json()] = child
+                child.visits += 1
+                return child
+            if not node.children:
+                break
+            node = self._best_child(node)
+            # Virtual visit: counts as a loss until the rollout result is backpropagated
+            node.visits += 1
+        return node
+
+    def _best_child(self, node: _Node) -> _Node:
+        log_visits = math.log(node.visits)
+
+        def uct(child: _Node) -> float:
+            return child.value / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+
+        return max(node.children.values(), key=uct)
+
+    @staticmethod
+    def _backpropagate(node: _Node | None, scores: Dict[str, float]) -> None:
+        while node is not None:
+            if node.mover is not None:
+                node.value += scores.get(node.mover, 0.0)
+            node = node.parent
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            # Agents are often built on worker threads (load tests, speculation); forking a
+            # threaded process can deadlock, so start workers fresh
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.game,),
+            )
+        return self._pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pools cannot be pickled (e.g. when shipping agents to Modal); recreate lazily
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
@@ -2,8 +2,22 @@ from typing import Any, Optional
 from lib import db
 
 
-def create_match(seed: str, *, game_key: str, game_version: str) -> int:
-    return db.insert_match(seed=seed, status="created", game_key=game_key, game_version=game_version)
+def create_match(
+    seed: str,
+    *,
+    game_key: str,
+    game_version: str,
+    agent_a: Optional[str] = None,
+    agent_b: Optional[str] = None,
+) -> int:
+    return db.insert_match(
+        seed=seed,
+        status="created",
+        game_key=game_key,
+        game_version=game_version,
+        agent_a=agent_a,
+        agent_b=agent_b,
+    )
 
 
 def record_turn(
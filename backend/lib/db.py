@@ -1,8 +1,36 @@
+import functools
 import json
+import threading
+from collections import Counter
 from contextlib import contextmanager
-from typing import Any, Optional
+from datetime import date, datetime
+from typing import Any, Callable, Optional, TypeVar
 from lib import config
 import psycopg
+from psycopg import sql
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Successful write calls per function, for load tests and diagnostics
+_write_counts: Counter = Counter()
+_write_counts_lock = threading.Lock()
+
+
+def _counted_write(fn: F) -> F:
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = fn(*args, **kwargs)
+        with _write_counts_lock:
+            _write_counts[fn.__name__] += 1
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def write_counts() -> dict[str, int]:
+    with _write_counts_lock:
+        return dict(_write_counts)
 
 
 @contextmanager
@@ -11,22 +39,31 @@ def get_conn():
         yield conn
 
 
-def insert_match(seed: str, status: str, game_key: str, game_version: str) -> int:
+@_counted_write
+def insert_match(
+    seed: str,
+    status: str,
+    game_key: str,
+    game_version: str,
+    agent_a: Optional[str] = None,
+    agent_b: Optional[str] = None,
+) -> int:
     with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                insert into matches (seed, status, game_key, game_version)
-                values (%s, %s, %s, %s)
+                insert into matches (seed, status, game_key, game_version, agent_a, agent_b)
+                values (%s, %s, %s, %s, %s, %s)
                 returning id
                 """,
-                (seed, status, game_key, game_version),
+                (seed, status, game_key, game_version, agent_a, agent_b),
             )
             (match_id,) = cur.fetchone()
             conn.commit()
             return match_id
 
 
+@_counted_write
 def update_match_status(match_id: int, status: str) -> None:
     with get_conn() as conn:
         with conn.cursor() as cur:
@@ -37,6 +74,7 @@ def update_match_status(match_id: int, status: str) -> None:
             conn.commit()
 
 
+@_counted_write
 def insert_turn(
     match_id: int,
     idx: int,
@@ -60,6 +98,7 @@ def insert_turn(
             return turn_id
 
 
+@_counted_write
 def insert_event(
     match_id: int,
     event_type: str,
@@ -81,6 +120,7 @@ def insert_event(
             return event_id
 
 
+@_counted_write
 def insert_state_snapshot(
     match_id: int,
     *,
@@ -104,6 +144,7 @@ def insert_state_snapshot(
             return snapshot_id
 
 
+@_counted_write
 def upsert_game_definition(
     *,
     game_key: str,
@@ -139,3 +180,288 @@ def upsert_game_definition(
             conn.commit()
 
 
+def fetch_match_history(match_id: int) -> dict[str, Any] | None:
+    """Load a match with its turns, initial state and final scores.
+
+    Intermediate snapshots are not read: retention compaction removes them.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "select id, status, game_key, game_version, agent_a, agent_b, created_at from matches where id = %s",
+                (match_id,),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return None
+            # Child rows are never older than their match; the bound lets Postgres skip older partitions
+            created_at = row[6]
+            cur.execute(
+                "select id, idx, actor, action from turns where match_id = %s and created_at >= %s order by idx",
+                (match_id, created_at),
+            )
+            turns = [{"id": t[0], "idx": t[1], "actor": t[2], "action": t[3]} for t in cur.fetchall()]
+            cur.execute(
+                """
+                select state from state_snapshots
+                where match_id = %s and created_at >= %s and turn_id is null
+                order by id limit 1
+                """,
+                (match_id, created_at),
+            )
+            initial = cur.fetchone()
+            cur.execute(
+                """
+                select payload from events
+                where match_id = %s and created_at >= %s and event_type = 'engine.match_finished'
+                order by id desc limit 1
+                """,
+                (match_id, created_at),
+            )
+            finished = cur.fetchone()
+    return {
+        "id": row[0],
+        "status": row[1],
+        "game_key": row[2],
+        "game_version": row[3],
+        "agents": {"agentA": row[4], "agentB": row[5]},
+        "turns": turns,
+        "initial_state": initial[0] if initial else None,
+        "scores": (finished[0] or {}).get("scores") if finished else None,
+        "reason": (finished[0] or {}).get("reason") if finished else None,
+    }
+
+
+def fetch_unindexed_match_ids(game_key: str, game_version: str, limit: int) -> list[int]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                select m.id from matches m
+                left join position_indexed_matches p on p.match_id = m.id
+                where m.game_key = %s and m.game_version = %s
+                    and m.status = 'finished' and p.match_id is null
+                order by m.id
+                limit %s
+                """,
+                (game_key, game_version, limit),
+            )
+            return [r[0] for r in cur.fetchall()]
+
+
+@_counted_write
+def insert_position_stats(
+    match_id: int,
+    *,
+    game_key: str,
+    game_version: str,
+    rows: list[dict[str, Any]],
+) -> bool:
+    """Add one match's moves to the position index; returns False if it was already indexed."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                insert into position_indexed_matches (match_id) values (%s)
+                on conflict (match_id) do nothing
+                returning match_id
+                """,
+                (match_id,),
+            )
+            if cur.fetchone() is None:
+                conn.rollback()
+                return False
+            cur.executemany(
+                """
+                insert into position_stats (
+                    game_key, game_version, position_hash, agent_name, action_key, action,
+                    plays, wins, draws, losses
+                ) values (%s, %s, %s, %s, %s, %s::jsonb, 1, %s, %s, %s)
+                on conflict (game_key, game_version, position_hash, agent_name, action_key)
+                do update set
+                    plays = position_stats.plays + 1,
+                    wins = position_stats.wins + excluded.wins,
+                    draws = position_stats.draws + excluded.draws,
+                    losses = position_stats.losses + excluded.losses,
+                    updated_at = now()
+                """,
+                [
+                    (
+                        game_key,
+                        game_version,
+                        r["position_hash"],
+                        r["agent_name"],
+                        r["action_key"],
+                        json.dumps(r["action"]),
+                        r["wins"],
+                        r["draws"],
+                        r["losses"],
+                    )
+                    for r in rows
+                ],
+            )
+            conn.commit()
+            return True
+
+
+def select_position_stats(
+    *,
+    game_key: str,
+    game_version: str,
+    position_hash: str,
+    agent_name: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                select agent_name, action, plays, wins, draws, losses
+                from position_stats
+                where game_key = %s and game_version = %s and position_hash = %s
+                    and (%s::varchar is null or agent_name = %s)
+                order by plays desc
+                """,
+                (game_key, game_version, position_hash, agent_name, agent_name),
+            )
+            return [
+                {
+                    "agent_name": r[0],
+                    "action": r[1],
+                    "plays": r[2],
+                    "wins": r[3],
+                    "draws": r[4],
+                    "losses": r[5],
+                }
+                for r in cur.fetchall()
+            ]
+
+
+def select_match_outcome(cache_key: str) -> dict[str, Any] | None:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("select result from match_outcomes where cache_key = %s", (cache_key,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+
+@_counted_write
+def insert_match_outcome(cache_key: str, *, match_id: int, result: dict[str, Any]) -> None:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                insert into match_outcomes (cache_key, match_id, result)
+                values (%s, %s, %s::jsonb)
+                on conflict (cache_key) do nothing
+                """,
+                (cache_key, match_id, json.dumps(result)),
+            )
+            conn.commit()
+
+
+def list_partitions(table: str) -> list[str]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                select child.relname
+                from pg_inherits
+                join pg_class parent on parent.oid = pg_inherits.inhparent
+                join pg_class child on child.oid = pg_inherits.inhrelid
+                where parent.relname = %s
+                order by child.relname
+                """,
+                (table,),
+            )
+            return [r[0] for r in cur.fetchall()]
+
+
+@_counted_write
+def create_partition(table: str, partition: str, *, start: date, end: date) -> None:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("create table if not exists {} partition of {} for values from ({}) to ({})").format(
+                    sql.Identifier(partition),
+                    sql.Identifier(table),
+                    sql.Literal(start),
+                    sql.Literal(end),
+                )
+            )
+            conn.commit()
+
+
+@_counted_write
+def drop_partition(table: str, partition: str) -> None:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            # Detach first so the parent only holds a brief lock, then drop the standalone table
+            cur.execute(
+                sql.SQL("alter table {} detach partition {}").format(sql.Identifier(table), sql.Identifier(partition))
+            )
+            cur.execute(sql.SQL("drop table {}").format(sql.Identifier(partition)))
+            conn.commit()
+
+
+@_counted_write
+def delete_matches_before(game_key: str, before: datetime) -> int:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "delete from matches where game_key = %s and created_at < %s",
+                (game_key, before),
+            )
+            conn.commit()
+            return cur.rowcount
+
+
+@_counted_write
+def compact_matches_before(game_key: str, before: datetime, *, limit: int) -> int:
+    """Strip finished matches down to the match, its turns, initial and final snapshots and outcome event."""
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                select id, created_at from matches
+                where game_key = %s and status = 'finished' and created_at < %s and compacted_at is null
+                order by id
+                limit %s
+                """,
+                (game_key, before, limit),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return 0
+            match_ids = [r[0] for r in rows]
+            # Child rows are never older than their match, which lets Postgres prune old partitions
+            oldest = min(r[1] for r in rows)
+            cur.execute(
+                """
+                delete from events
+                where match_id = any(%s) and created_at >= %s and event_type <> 'engine.match_finished'
+                """,
+                (match_ids, oldest),
+            )
+            cur.execute(
+                """
+                delete from state_snapshots s
+                where s.match_id = any(%s) and s.created_at >= %s and s.turn_id is not null
+                    and s.id <> (
+                        select max(f.id) from state_snapshots f
+                        where f.match_id = s.match_id and f.created_at >= %s
+                    )
+                """,
+                (match_ids, oldest, oldest),
+            )
+            cur.execute("update matches set compacted_at = now() where id = any(%s)", (match_ids,))
+            conn.commit()
+            return len(match_ids)
+
+
+def list_game_keys() -> list[str]:
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("select distinct game_key from game_definitions order by game_key")
+            return [r[0] for r in cur.fetchall()]
+
+
@@ -1,20 +1,73 @@
+import hashlib
+import json
 import random
-from typing import List, Tuple
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, MutableMapping, Tuple
+from loguru import logger
+
 from lib.core.agent import Agent
-from .models import TicTacToeAction, TicTacToeObservation
+from lib.core.mcts import MCTSAgent
+from lib import config
+from lib.openrouter import OpenRouter
+from .models import TicTacToeAction, TicTacToeObservation, TicTacToeState
+from .spec import TicTacToeGameSpec
+
+
+SYSTEM_PROMPT = (
+    "You are playing tic-tac-toe. The board is a 3x3 grid of rows and columns indexed from 0; "
+    "empty cells are shown as '.'. Reply with a single JSON object of the form "
+    '{"row": <int>, "col": <int>} naming an empty cell, and nothing else.'
+)
+
+
+def legal_moves(board: list[list[str]]) -> List[Tuple[int, int]]:
+    return [(r, c) for r in range(3) for c in range(3) if board[r][c] == " "]
+
+
+def _mark_for(player: str) -> str:
+    return "X" if player == "agentA" else "O"
+
+
+def _completes_line(board: list[list[str]], row: int, col: int, mark: str) -> bool:
+    trial = [r.copy() for r in board]
+    trial[row][col] = mark
+    return TicTacToeGameSpec._check_winner(trial) == mark
+
+
+def rank_opponent_moves(observation: TicTacToeObservation) -> List[Tuple[int, int]]:
+    """Order the opponent's legal replies by how likely a sensible player is to choose them."""
+    opponent_mark = "O" if observation.you == "agentA" else "X"
+    own_mark = _mark_for(observation.you)
+
+    def priority(cell: Tuple[int, int]) -> int:
+        row, col = cell
+        if _completes_line(observation.board, row, col, opponent_mark):
+            return 4
+        if _completes_line(observation.board, row, col, own_mark):
+            return 3
+        if cell == (1, 1):
+            return 2
+        if row != 1 and col != 1:
+            return 1
+        return 0
+
+    return sorted(legal_moves(observation.board), key=priority, reverse=True)
 
 
 class RandomLegalAgent(Agent[TicTacToeAction, TicTacToeObservation]):
     def __init__(self, name: str, *, seed: str | None = None) -> None:
         self.name = name
+        self.seed = seed
         self._rng = random.Random(seed)
+        self._played = False
 
     def produce_action(self, turn_index: int, observation: TicTacToeObservation) -> TicTacToeAction:
         obs = observation
+        self._played = True
 
-        legal: List[Tuple[int, int]] = [
-            (r, c) for r in range(3) for c in range(3) if obs.board[r][c] == " "
-        ]
+        legal = legal_moves(obs.board)
         if not legal:
             # Should not happen if engine checks terminal, but return a dummy move
             return TicTacToeAction(type="move", payload={"row": 0, "col": 0})
@@ -24,4 +77,209 @@ class RandomLegalAgent(Agent[TicTacToeAction, TicTacToeObservation]):
     def receive_outcome(self, event):
         return None
 
+    def fingerprint(self) -> dict | None:
+        # Only a seeded agent whose RNG has not been consumed replays identically
+        if self.seed is None or self._played:
+            return None
+        return {"type": "RandomLegalAgent", "seed": self.seed}
+
+
+class MCTSTicTacToeAgent(MCTSAgent[TicTacToeState, TicTacToeAction, TicTacToeObservation]):
+    def __init__(
+        self,
+        name: str,
+        *,
+        iterations: int | None = 1000,
+        time_limit: float | None = None,
+        workers: int = 1,
+        seed: str | None = None,
+    ) -> None:
+        spec = TicTacToeGameSpec()
+        super().__init__(
+            name,
+            spec,
+            state_from_observation=spec.state_from_observation,
+            iterations=iterations,
+            time_limit=time_limit,
+            workers=workers,
+            seed=seed,
+        )
+
+
+class LLMAgent(Agent[TicTacToeAction, TicTacToeObservation]):
+    """Plays by asking an OpenRouter model for a move.
+
+    With ``speculate > 0`` the agent uses the opponent's thinking time: it predicts
+    the opponent's most likely replies and requests its own answer to each resulting
+    position in the background. A hit is returned without a new API call; misses are
+    cancelled. ``max_speculative_calls`` caps the speculative requests actually sent
+    per match; requests cancelled before they start do not count. Per-match state is
+    also reset when turn numbers start over, so a match that ended in an error (and
+    never delivered an outcome) does not leak prefetches into the next one.
+
+    ``response_cache`` stores replies by request; prefetch threads share it, so every
+    access goes through the agent's lock. Only a temperature-0 agent with a cache is
+    treated as deterministic for outcome caching.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        model: str,
+        temperature: float = 0.0,
+        client: OpenRouter | None = None,
+        speculate: int = 0,
+        max_speculative_calls: int | None = 16,
+        response_cache: MutableMapping[str, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.model = model
+        self.temperature = temperature
+        self.speculate = speculate
+        self.max_speculative_calls = max_speculative_calls
+        self._client = client
+        self.response_cache = response_cache
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: Dict[str, Future] = {}
+        self._speculative_calls = 0
+        self._speculative_hits = 0
+        self._budget_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._last_turn = 0
+
+    def produce_action(self, turn_index: int, observation: TicTacToeObservation) -> TicTacToeAction:
+        self._start_turn(turn_index)
+        key = observation.model_dump_json()
+        future = self._pending.pop(key, None)
+        self._discard_pending()
+        if future is not None:
+            try:
+                action = future.result()
+            except Exception:
+                logger.exception(f"llm.speculation_error agent={self.name} turn={turn_index}")
+                action = None
+            if action is not None:
+                self._speculative_hits += 1
+                logger.debug(f"llm.speculation_hit agent={self.name} turn={turn_index}")
+                return action
+        return self._request_move(observation)
+
+    def observe_opponent_turn(self, turn_index: int, observation: TicTacToeObservation) -> None:
+        self._start_turn(turn_index)
+        if self.speculate <= 0:
+            return
+        opponent_mark = "O" if observation.you == "agentA" else "X"
+        candidates: list[TicTacToeObservation] = []
+        for row, col in rank_opponent_moves(observation):
+            board = [r.copy() for r in observation.board]
+            board[row][col] = opponent_mark
+            # A finished board never comes back to us, so there is nothing to prefetch
+            if TicTacToeGameSpec._check_winner(board) or not legal_moves(board):
+                continue
+            candidates.append(TicTacToeObservation(board=board, you=observation.you))
+        for predicted in candidates[: self.speculate]:
+            if self._budget_exhausted():
+                break
+            key = predicted.model_dump_json()
+            if key not in self._pending:
+                self._pending[key] = self._get_executor().submit(self._speculative_move, predicted)
+
+    def receive_outcome(self, event):
+        self._reset_match()
+        return None
+
+    def fingerprint(self) -> dict | None:
+        # Providers are not reproducible even at temperature 0; only cached replies are
+        if self.temperature != 0 or self.response_cache is None:
+            return None
+        return {
+            "type": "LLMAgent",
+            "endpoint": self._client.base_url if self._client is not None else config.OPEN_ROUTER_BASE_URL,
+            "model": self.model,
+            "temperature": self.temperature,
+            "system_prompt": SYSTEM_PROMPT,
+        }
+
+    def _start_turn(self, turn_index: int) -> None:
+        # Turn numbers only grow within a match; going back means a new match has begun
+        if turn_index <= self._last_turn:
+            self._reset_match()
+        self._last_turn = turn_index
+
+    def _reset_match(self) -> None:
+        self._discard_pending()
+        if self.speculate > 0:
+            logger.info(
+                f"llm.speculation agent={self.name} calls={self._speculative_calls} hits={self._speculative_hits}"
+            )
+        self._speculative_calls = 0
+        self._speculative_hits = 0
+        self._last_turn = 0
+
+    def _budget_exhausted(self) -> bool:
+        return self.max_speculative_calls is not None and self._speculative_calls >= self.max_speculative_calls
+
+    def _speculative_move(self, observation: TicTacToeObservation) -> TicTacToeAction | None:
+        # Charge the budget only when the request is actually about to be sent
+        with self._budget_lock:
+            if self._budget_exhausted():
+                return None
+            self._speculative_calls += 1
+        return self._request_move(observation)
+
+    def _request_move(self, observation: TicTacToeObservation) -> TicTacToeAction:
+        messages = self._messages(observation)
+        cache_key = None
+        if self.response_cache is not None:
+            request = json.dumps([self.model, self.temperature, messages], sort_keys=True)
+            cache_key = hashlib.sha256(request.encode()).hexdigest()
+            with self._cache_lock:
+                cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return self._parse_move(cached)
+        response = self._get_client().generate(self.model, messages, temperature=self.temperature)
+        content = response.choices[0].message.content or ""
+        if cache_key is not None:
+            with self._cache_lock:
+                self.response_cache[cache_key] = content
+        return self._parse_move(content)
+
+    @staticmethod
+    def _messages(observation: TicTacToeObservation) -> list[dict[str, str]]:
+        rows = "\n".join("".join(cell if cell != " " else "." for cell in row) for row in observation.board)
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"You play {_mark_for(observation.you)}.\nBoard:\n{rows}\nYour move?"},
+        ]
+
+    @staticmethod
+    def _parse_move(content: str) -> TicTacToeAction:
+        match = re.search(r"\{.*?\}", content, re.DOTALL)
+        try:
+            payload = json.loads(match.group(0)) if match else {}
+            row, col = int(payload["row"]), int(payload["col"])
+        except (ValueError, KeyError, TypeError):
+            # Unparseable replies become an out-of-bounds move so the engine records a forfeit
+            row, col = -1, -1
+        return TicTacToeAction(type="move", payload={"row": row, "col": col})
+
+    def _discard_pending(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        # Requests already in flight cannot be cancelled; leave them to finish on the old
+        # executor so the next turn's prefetches get fresh threads instead of queueing
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_client(self) -> OpenRouter:
+        if self._client is None:
+            self._client = OpenRouter()
+        return self._client
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.speculate))
+        return self._executor
@@ -1,12 +1,30 @@
+import hashlib
 import random
 from lib.core.types import TransitionResult, Event
 from lib.core.game import GameSpec as GameSpecProto
 from .models import TicTacToeState, TicTacToeAction, TicTacToeObservation
 
 
+# The 8 symmetries of the square (dihedral group D4) as cell mappings (row, col) -> (row, col)
+SYMMETRIES = [
+    lambda r, c: (r, c),
+    lambda r, c: (c, 2 - r),
+    lambda r, c: (2 - r, 2 - c),
+    lambda r, c: (2 - c, r),
+    lambda r, c: (r, 2 - c),
+    lambda r, c: (2 - r, c),
+    lambda r, c: (c, r),
+    lambda r, c: (2 - c, 2 - r),
+]
+# Index of the inverse mapping for each entry of SYMMETRIES
+INVERSE_SYMMETRIES = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
 class TicTacToeGameSpec(GameSpecProto[TicTacToeState, TicTacToeAction, TicTacToeObservation]):
     game_key: str = "tictactoe"
     game_version: str = "v1"
+    state_model = TicTacToeState
+    action_model = TicTacToeAction
 
     def initial_state(self, seed: str) -> TicTacToeState:
         random.seed(seed)
@@ -42,6 +60,16 @@ class TicTacToeGameSpec(GameSpecProto[TicTacToeState, TicTacToeAction, TicTacToe
 
         return TransitionResult[TicTacToeState](state_after=new_state, events=events)
 
+    def legal_actions(self, state: TicTacToeState) -> list[TicTacToeAction]:
+        if self.is_terminal(state):
+            return []
+        return [
+            TicTacToeAction(type="move", payload={"row": r, "col": c})
+            for r in range(3)
+            for c in range(3)
+            if state.board[r][c] == " "
+        ]
+
     def is_terminal(self, state: TicTacToeState) -> bool:
         return state.winner is not None or self._is_draw(state.board)
 
@@ -56,6 +84,33 @@ class TicTacToeGameSpec(GameSpecProto[TicTacToeState, TicTacToeAction, TicTacToe
     def observation_for(self, state: TicTacToeState, actor: str) -> TicTacToeObservation:
         return TicTacToeObservation(board=[r.copy() for r in state.board], you=actor)
 
+    def state_from_observation(self, observation: TicTacToeObservation) -> TicTacToeState:
+        # Tic-tac-toe is fully observable: an agent is only asked to move in a live position
+        return TicTacToeState(board=[r.copy() for r in observation.board], player=observation.you, winner=None)
+
+    def canonical_position(self, state: TicTacToeState) -> tuple[str, list[int]]:
+        """Hash the position up to board symmetry, folding in the side to move.
+
+        Returns the hash and every symmetry index that maps the board onto its
+        canonical orientation (more than one when the position is itself symmetric).
+        """
+        images: list[tuple[str, int]] = []
+        for t, sym in enumerate(SYMMETRIES):
+            board = [[" "] * 3 for _ in range(3)]
+            for r in range(3):
+                for c in range(3):
+                    tr, tc = sym(r, c)
+                    board[tr][tc] = state.board[r][c]
+            images.append(("".join("".join(row) for row in board), t))
+        canonical = min(board for board, _ in images)
+        digest = hashlib.blake2b(f"{canonical}|{state.player}".encode(), digest_size=8).hexdigest()
+        return digest, [t for board, t in images if board == canonical]
+
+    def transform_action(self, action: TicTacToeAction, transform: int, *, inverse: bool = False) -> TicTacToeAction:
+        sym = SYMMETRIES[INVERSE_SYMMETRIES[transform] if inverse else transform]
+        row, col = sym(int(action.payload["row"]), int(action.payload["col"]))
+        return TicTacToeAction(type=action.type, payload={"row": row, "col": col})
+
     def schemas(self) -> dict:
         # Export JSON Schemas for State, Action, Observation, and a generic Event payload
         return {
@@ -0,0 +1,255 @@
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict
+from loguru import logger
+
+from lib import db
+from lib.core.agent import Agent
+from lib.core.types import Event
+from lib.games.tictactoe.agents import legal_moves
+from lib.games.tictactoe.models import TicTacToeAction, TicTacToeObservation
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal response latency, the usual shape of LLM API round trips."""
+
+    median_ms: float = 800.0
+    sigma: float = 0.5
+    min_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return max(self.min_ms, rng.lognormvariate(0.0, self.sigma) * self.median_ms) / 1000.0
+
+
+@dataclass
+class BehaviourModel:
+    latency: LatencyModel
+    error_rate: float = 0.0
+    illegal_rate: float = 0.0
+    response_bytes: int = 200
+
+
+class SyntheticAgentError(RuntimeError):
+    pass
+
+
+def _pick_move(board: list[list[str]], rng: random.Random, illegal_rate: float) -> tuple[int, int]:
+    legal = legal_moves(board)
+    occupied = [(r, c) for r in range(3) for c in range(3) if (r, c) not in legal]
+    if occupied and rng.random() < illegal_rate:
+        return rng.choice(occupied)
+    return rng.choice(legal) if legal else (0, 0)
+
+
+class SyntheticAgent(Agent[TicTacToeAction, TicTacToeObservation]):
+    """In-process stand-in for an LLM agent: sleeps, sometimes fails, sometimes plays illegally."""
+
+    def __init__(self, name: str, behaviour: BehaviourModel, *, seed: str | None = None) -> None:
+        self.name = name
+        self.behaviour = behaviour
+        self._rng = random.Random(seed)
+
+    def produce_action(self, turn_index: int, observation: TicTacToeObservation) -> TicTacToeAction:
+        time.sleep(self.behaviour.latency.sample(self._rng))
+        if self._rng.random() < self.behaviour.error_rate:
+            raise SyntheticAgentError(f"synthetic failure on turn {turn_index}")
+        # Mimic the cost of decoding a response of realistic size
+        json.loads(json.dumps({"content": "x" * self.behaviour.response_bytes}))
+        row, col = _pick_move(observation.board, self._rng, self.behaviour.illegal_rate)
+        return TicTacToeAction(type="move", payload={"row": row, "col": col})
+
+    def receive_outcome(self, event: Event) -> None:
+        return None
+
+
+class TimedAgent(Agent[Any, Any]):
+    """Delegating wrapper that records how long each ``produce_action`` call takes."""
+
+    def __init__(self, inner: Agent, sink: list[float], lock: threading.Lock) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self._sink = sink
+        self._lock = lock
+
+    def produce_action(self, turn_index: int, observation: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self.inner.produce_action(turn_index, observation)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._sink.append(elapsed)
+
+    def observe_opponent_turn(self, turn_index: int, observation: Any) -> None:
+        hook = getattr(self.inner, "observe_opponent_turn", None)
+        if hook is not None:
+            hook(turn_index, observation)
+
+    def receive_outcome(self, event: Event) -> None:
+        self.inner.receive_outcome(event)
+
+
+def _parse_board(messages: list[dict[str, Any]]) -> list[list[str]]:
+    content = str(messages[-1].get("content", "")) if messages else ""
+    if "Board:\n" in content:
+        rows = content.split("Board:\n", 1)[1].split("\n")[:3]
+        if len(rows) == 3 and all(len(r) == 3 for r in rows):
+            return [[" " if ch == "." else ch for ch in r] for r in rows]
+    return [[" "] * 3 for _ in range(3)]
+
+
+class FakeOpenRouterServer:
+    """Local OpenAI-compatible ``/chat/completions`` endpoint with modelled latency and failures.
+
+    Point ``OpenRouter(base_url=server.base_url)`` at it to exercise the real client path.
+    """
+
+    def __init__(self, behaviour: BehaviourModel, *, host: str = "127.0.0.1", port: int = 0, seed: str | None = None):
+        self.behaviour = behaviour
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def start(self) -> "FakeOpenRouterServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenRouterServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _draw(self, body: dict[str, Any]) -> tuple[float, bool, tuple[int, int]]:
+        with self._rng_lock:
+            self.requests += 1
+            delay = self.behaviour.latency.sample(self._rng)
+            failed = self._rng.random() < self.behaviour.error_rate
+            move = _pick_move(_parse_board(body.get("messages", [])), self._rng, self.behaviour.illegal_rate)
+        return delay, failed, move
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                delay, failed, (row, col) = server._draw(body)
+                time.sleep(delay)
+                if failed or not self.path.endswith("/chat/completions"):
+                    self._send(500 if failed else 404, {"error": {"message": "synthetic failure"}})
+                    return
+                padding = "." * max(0, server.behaviour.response_bytes)
+                content = f"{padding}\n{json.dumps({'row': row, 'col': col})}"
+                self._send(
+                    200,
+                    {
+                        "id": f"fake-{server.requests}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "fake"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    },
+                )
+
+            def _send(self, status: int, payload: dict[str, Any]) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return Handler
+
+
+def _diff_counts(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    return {name: after[name] - before.get(name, 0) for name in after if after[name] != before.get(name, 0)}
+
+
+def _percentiles(samples: list[float]) -> Dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p90_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49] * 1000, "p90_ms": cuts[89] * 1000, "p99_ms": cuts[98] * 1000}
+
+
+def run_load_test(
+    make_agents: Callable[[int], tuple[Agent, Agent]],
+    run_match: Callable[[Agent, Agent], Dict[str, Any]],
+    *,
+    matches: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Play ``matches`` matches with at most ``concurrency`` in flight and summarise throughput."""
+    latencies: list[float] = []
+    lock = threading.Lock()
+    failures: Counter = Counter()
+
+    def play(i: int) -> Dict[str, Any]:
+        agent_a, agent_b = make_agents(i)
+        return run_match(TimedAgent(agent_a, latencies, lock), TimedAgent(agent_b, latencies, lock))
+
+    # Counted in lib.db, so orchestrator writes (schemas, position index, outcome cache) are included
+    writes_before = db.write_counts()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(play, i) for i in range(matches)]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as exc:
+                failures[exc.__class__.__name__] += 1
+    elapsed = time.perf_counter() - started
+    writes = _diff_counts(writes_before, db.write_counts())
+
+    total_writes = sum(writes.values())
+    report = {
+        "matches": matches,
+        "failed": sum(failures.values()),
+        "failures": dict(failures),
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "matches_per_s": (matches - sum(failures.values())) / elapsed if elapsed else 0.0,
+        "turns": len(latencies),
+        "turn_latency": _percentiles(latencies),
+        "db_writes": writes,
+        "db_writes_per_s": total_writes / elapsed if elapsed else 0.0,
+    }
+    logger.info(f"loadtest.report {json.dumps(report)}")
+    return report
@@ -4,14 +4,23 @@ from openai import OpenAI
 
 
 class OpenRouter:
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        max_retries: int = 2,
+    ):
+        self.base_url = base_url or config.OPEN_ROUTER_BASE_URL
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=config.OPEN_ROUTER_API_KEY,
+            base_url=self.base_url,
+            api_key=api_key or config.OPEN_ROUTER_API_KEY,
+            max_retries=max_retries,
         )
 
-    def generate(self, model_name: str, messages: list[dict[str, Any]]):
+    def generate(self, model_name: str, messages: list[dict[str, Any]], **params: Any):
         return self.client.chat.completions.create(
             model=model_name,
             messages=messages,
-        )
\ No newline at end of file
+            **params,
+        )
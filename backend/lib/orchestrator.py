@@ -1,9 +1,12 @@
-from typing import Literal, Dict, Any, Iterable
+import hashlib
+import json
+from typing import Literal, Dict, Any, Iterable, Optional
 from loguru import logger
 
 from lib.core.agent import Agent
 from lib.core.engine import Engine
-from lib.db import upsert_game_definition
+from lib.db import insert_match_outcome, select_match_outcome, upsert_game_definition
+from lib import position_index
 
 Actor = Literal["agentA", "agentB"]
 
@@ -22,21 +25,70 @@ def register_games(specs: Iterable[Any]) -> None:
         )
 
 
+def outcome_cache_key(
+    agent_a: Agent,
+    agent_b: Agent,
+    *,
+    game: Any,
+    seed: str,
+    max_turns: int,
+) -> Optional[str]:
+    """Content address of a fully deterministic match, or None if either agent is not reproducible."""
+    fingerprints = []
+    for agent in (agent_a, agent_b):
+        fingerprint = getattr(agent, "fingerprint", None)
+        config = fingerprint() if fingerprint is not None else None
+        if config is None:
+            return None
+        fingerprints.append({"name": agent.name, "config": config})
+    material = {
+        "game_key": game.game_key,
+        "game_version": game.game_version,
+        "max_turns": max_turns,
+        "seed": seed,
+        "agents": fingerprints,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
 def run_match(
     agent_a: Agent,
     agent_b: Agent,
     *,
     max_turns: int = 9,
     game: Any,
+    index_positions: bool = True,
+    seed: Optional[str] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """Run a match between two provided agents using the core Engine.
 
-    Keeps the external API stable for Modal and CLI.
+    Keeps the external API stable for Modal and CLI. When a seed is given and both
+    agents are deterministic, the stored outcome of an identical earlier match is
+    returned instead of replaying it; pass ``use_cache=False`` to always play.
     """
+    cache_key = None
+    if use_cache and seed is not None:
+        cache_key = outcome_cache_key(agent_a, agent_b, game=game, seed=seed, max_turns=max_turns)
+    if cache_key is not None:
+        cached = select_match_outcome(cache_key)
+        if cached is not None:
+            logger.info(f"orchestrator.cache_hit key={cache_key} match_id={cached.get('match_id')}")
+            return {**cached, "cached": True}
+
     logger.info(f"Starting match with {agent_a.name} vs {agent_b.name}")
     engine = Engine()
     # Ensure the game's schema is present in DB
     register_games([game])
-    return engine.run_match(agent_a=agent_a, agent_b=agent_b, game=game, max_turns=max_turns)
+    result = engine.run_match(agent_a=agent_a, agent_b=agent_b, game=game, max_turns=max_turns, seed=seed)
+    if cache_key is not None and result.get("status") == "finished":
+        insert_match_outcome(cache_key, match_id=result["match_id"], result=result)
+    if index_positions and position_index.supports_index(game):
+        try:
+            position_index.index_match(game, result["match_id"])
+        except Exception:
+            # The index is derived data and can be backfilled; never fail a finished match over it
+            logger.exception(f"position_index.error match_id={result['match_id']}")
+    return result
 
 
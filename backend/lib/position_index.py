@@ -0,0 +1,97 @@
+from typing import Any, Dict
+from loguru import logger
+
+from lib import db
+
+
+def supports_index(spec: Any) -> bool:
+    return all(
+        hasattr(spec, attr) for attr in ("canonical_position", "transform_action", "state_model", "action_model")
+    )
+
+
+def _canonical_action(spec: Any, action: Any, transforms: list[int]) -> Any:
+    # A symmetric position has several canonical orientations; pick the smallest image of the move
+    images = [spec.transform_action(action, t) for t in transforms]
+    return min(images, key=lambda a: a.model_dump_json())
+
+
+def _outcome(score: float) -> Dict[str, int]:
+    return {"wins": int(score == 1.0), "draws": int(score == 0.5), "losses": int(score == 0.0)}
+
+
+def index_match(spec: Any, match_id: int) -> bool:
+    """Fold a finished match's moves into the position index.
+
+    Each turn is keyed by the canonical hash of the position it was played from,
+    with the move mapped into the same orientation. Re-indexing a match is a no-op.
+    Matches cut off by ``max_turns`` have no result to credit; they are marked as
+    seen without adding any rows.
+    """
+    history = db.fetch_match_history(match_id)
+    if history is None or history["status"] != "finished" or not history["scores"]:
+        return False
+    if history["initial_state"] is None:
+        return False
+
+    rows: list[dict[str, Any]] = []
+    # Replay from the initial state so compacted matches (no per-turn snapshots) index correctly
+    state = spec.state_model(**history["initial_state"])
+    for turn in history["turns"]:
+        action = spec.action_model(**turn["action"])
+        position_hash, transforms = spec.canonical_position(state)
+        canonical = _canonical_action(spec, action, transforms)
+        actor = turn["actor"]
+        rows.append(
+            {
+                "position_hash": position_hash,
+                "agent_name": history["agents"].get(actor) or actor,
+                "action_key": canonical.model_dump_json(),
+                "action": canonical.model_dump(),
+                **_outcome(float(history["scores"].get(actor, 0.0))),
+            }
+        )
+        state = spec.apply_action(state, action).state_after
+
+    if history["reason"] != "forfeit" and not spec.is_terminal(state):
+        db.insert_position_stats(
+            match_id, game_key=history["game_key"], game_version=history["game_version"], rows=[]
+        )
+        logger.debug(f"position_index.skipped_unfinished match_id={match_id} turns={len(rows)}")
+        return False
+
+    indexed = db.insert_position_stats(
+        match_id,
+        game_key=history["game_key"],
+        game_version=history["game_version"],
+        rows=rows,
+    )
+    logger.debug(f"position_index.indexed match_id={match_id} turns={len(rows)} new={indexed}")
+    return indexed
+
+
+def backfill(spec: Any, limit: int = 1000) -> int:
+    """Index finished matches that are not in the index yet; returns how many were added."""
+    count = 0
+    for match_id in db.fetch_unindexed_match_ids(spec.game_key, spec.game_version, limit):
+        if index_match(spec, match_id):
+            count += 1
+    return count
+
+
+def lookup(spec: Any, state: Any, agent_name: str | None = None) -> list[Dict[str, Any]]:
+    """Move statistics for every symmetric variant of ``state``.
+
+    Moves are mapped back into the orientation of the queried board.
+    """
+    position_hash, transforms = spec.canonical_position(state)
+    rows = db.select_position_stats(
+        game_key=spec.game_key,
+        game_version=spec.game_version,
+        position_hash=position_hash,
+        agent_name=agent_name,
+    )
+    for row in rows:
+        canonical = spec.action_model(**row["action"])
+        row["action"] = spec.transform_action(canonical, transforms[0], inverse=True).model_dump()
+    return rows
@@ -0,0 +1,124 @@
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from lib import db
+
+
+PARTITIONED_TABLES = ("turns", "events", "state_snapshots")
+_PARTITION_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+@dataclass
+class RetentionPolicy:
+    # Strip finished matches to match, turns, initial/final snapshots and outcome event after this many days
+    compact_after_days: Optional[int] = 30
+    # Delete matches entirely after this many days; None keeps them forever
+    drop_after_days: Optional[int] = None
+
+
+DEFAULT_POLICY = RetentionPolicy()
+
+
+def _month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _add_months(d: date, months: int) -> date:
+    year, month = divmod(d.month - 1 + months, 12)
+    return date(d.year + year, month + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def _partition_bounds(name: str) -> Optional[tuple[date, date]]:
+    match = _PARTITION_RE.search(name)
+    if match is None:
+        return None
+    start = date(int(match.group(1)), int(match.group(2)), 1)
+    return start, _add_months(start, 1)
+
+
+def ensure_partitions(months_ahead: int = 2, *, today: Optional[date] = None) -> list[str]:
+    """Create monthly partitions from the current month through ``months_ahead`` months ahead.
+
+    Partitions must exist before rows for that month arrive, otherwise they land in the
+    default partition and the month can no longer be attached.
+    """
+    current = _month_start(today or datetime.now(timezone.utc).date())
+    created: list[str] = []
+    for table in PARTITIONED_TABLES:
+        existing = set(db.list_partitions(table))
+        for offset in range(months_ahead + 1):
+            start = _add_months(current, offset)
+            name = partition_name(table, start)
+            if name in existing:
+                continue
+            db.create_partition(table, name, start=start, end=_add_months(start, 1))
+            created.append(name)
+    return created
+
+
+def drop_expired_partitions(
+    policies: Dict[str, RetentionPolicy],
+    *,
+    default: RetentionPolicy = DEFAULT_POLICY,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """Drop whole monthly partitions that every game's policy has expired.
+
+    Partitions are shared by all games, so the longest retention wins; any game (or the
+    default) keeping data forever disables partition drops entirely.
+    """
+    windows = [p.drop_after_days for p in [default, *policies.values()]]
+    if any(days is None for days in windows):
+        return []
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max(windows))
+    dropped: list[str] = []
+    for table in PARTITIONED_TABLES:
+        for name in db.list_partitions(table):
+            bounds = _partition_bounds(name)
+            if bounds is None or bounds[1] > cutoff.date():
+                continue
+            db.drop_partition(table, name)
+            dropped.append(name)
+    return dropped
+
+
+def apply_retention(
+    policies: Dict[str, RetentionPolicy],
+    *,
+    default: RetentionPolicy = DEFAULT_POLICY,
+    months_ahead: int = 2,
+    compact_batch: int = 1000,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Run one retention pass: pre-create partitions, drop expired data, compact the rest."""
+    now = now or datetime.now(timezone.utc)
+    report: Dict[str, Any] = {
+        "created_partitions": ensure_partitions(months_ahead, today=now.date()),
+        # Dropping partitions first leaves only the rows that straddle a month boundary for the deletes below
+        "dropped_partitions": drop_expired_partitions(policies, default=default, now=now),
+        "deleted_matches": {},
+        "compacted_matches": {},
+    }
+    for game_key in db.list_game_keys():
+        policy = policies.get(game_key, default)
+        if policy.drop_after_days is not None:
+            before = now - timedelta(days=policy.drop_after_days)
+            report["deleted_matches"][game_key] = db.delete_matches_before(game_key, before)
+        if policy.compact_after_days is not None:
+            before = now - timedelta(days=policy.compact_after_days)
+            total = 0
+            while True:
+                count = db.compact_matches_before(game_key, before, limit=compact_batch)
+                total += count
+                if count < compact_batch:
+                    break
+            report["compacted_matches"][game_key] = total
+    logger.info(f"retention.finished {report}")
+    return report
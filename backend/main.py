@@ -2,16 +2,36 @@ import fire
 
 from remote.deploy import run_a_match, app
 from lib.orchestrator import run_match as run_match_local
-from lib.games.tictactoe.agents import RandomLegalAgent
+from lib.games.tictactoe.agents import MCTSTicTacToeAgent, RandomLegalAgent
 from lib.games.tictactoe.spec import TicTacToeGameSpec
 
 
-def match(game: str = "tictactoe", turns: int = 9, mode: str = "local"):
+def make_agent(kind: str, seat: str, seed: str | None = None):
+    # Named by kind so stored matches and the position index say who played, not which seat
+    agent_seed = f"{seed}-{seat}" if seed is not None else None
+    if kind == "random":
+        return RandomLegalAgent("random", seed=agent_seed)
+    if kind == "mcts":
+        return MCTSTicTacToeAgent("mcts", seed=agent_seed)
+    raise ValueError("agent must be 'random' or 'mcts'")
+
+
+def match(
+    game: str = "tictactoe",
+    turns: int = 9,
+    mode: str = "local",
+    agent_a: str = "random",
+    agent_b: str = "random",
+    seed: str | None = None,
+    no_cache: bool = False,
+):
     """
     Run a match.
 
     - mode="remote": run on Modal infra
     - mode="local": run locally using in-memory agents
+    - agent_a/agent_b: "random" or "mcts" (local mode only)
+    - seed: makes the match reproducible; seeded matchups reuse stored outcomes unless no_cache
     """
     if game != "tictactoe":
         raise ValueError("Only 'tictactoe' is supported in MVP")
@@ -21,10 +41,17 @@ def match(game: str = "tictactoe", turns: int = 9, mode: str = "local"):
         with app.run():
             run_a_match.remote(max_turns=turns)
     elif mode == "local":
-        a = RandomLegalAgent("agentA")
-        b = RandomLegalAgent("agentB")
+        a = make_agent(agent_a, "agentA", seed)
+        b = make_agent(agent_b, "agentB", seed)
         spec = TicTacToeGameSpec()
-        return run_match_local(agent_a=a, agent_b=b, max_turns=turns, game=spec)
+        return run_match_local(
+            agent_a=a,
+            agent_b=b,
+            max_turns=turns,
+            game=spec,
+            seed=seed,
+            use_cache=not no_cache,
+        )
     else:
         raise ValueError("mode must be 'remote' or 'local'")
 
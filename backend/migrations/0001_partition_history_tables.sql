@@ -0,0 +1,134 @@
+-- Convert turns, events and state_snapshots into tables range-partitioned by month on created_at.
+--
+-- Partitioned tables need the partition key in every unique constraint, so primary keys become
+-- (id, created_at) (named *_partitioned_pkey so they do not clash with the legacy keys)
+-- and ids come from plain sequences. state_snapshots.turn_id can no longer be a
+-- foreign key to turns; both still cascade from matches. Monthly partitions are named
+-- <table>_pYYYY_MM and are created ahead of time by `python -m bin.retention run`; a default
+-- partition catches anything outside the created range.
+--
+-- It also converts the plain tables `bun db:push` creates on a fresh database, whose
+-- keys and indexes already carry the partitioned names; those are moved aside first.
+--
+-- Apply once with: psql "$DATABASE_URL" -f migrations/0001_partition_history_tables.sql
+
+begin;
+
+alter table matches add column if not exists compacted_at timestamp with time zone;
+
+alter table state_snapshots rename to state_snapshots_legacy;
+alter table events rename to events_legacy;
+alter table turns rename to turns_legacy;
+
+-- Identity sequences keep their names when a table is renamed; move them aside too
+alter sequence if exists state_snapshots_id_seq rename to state_snapshots_legacy_id_seq;
+alter sequence if exists events_id_seq rename to events_legacy_id_seq;
+alter sequence if exists turns_id_seq rename to turns_legacy_id_seq;
+
+-- Only present on tables created by `bun db:push`; renaming a key's index renames the key
+alter index if exists state_snapshots_partitioned_pkey rename to state_snapshots_legacy_pkey;
+alter index if exists events_partitioned_pkey rename to events_legacy_pkey;
+alter index if exists turns_partitioned_pkey rename to turns_legacy_pkey;
+alter index if exists state_snapshots_match_id_idx rename to state_snapshots_legacy_match_id_idx;
+alter index if exists events_match_id_idx rename to events_legacy_match_id_idx;
+alter index if exists turns_match_id_idx rename to turns_legacy_match_id_idx;
+
+create sequence turns_id_seq as integer;
+create sequence events_id_seq as integer;
+create sequence state_snapshots_id_seq as integer;
+
+create table turns (
+    id integer not null default nextval('turns_id_seq'),
+    match_id integer not null
+        constraint turns_match_id_matches_id_fk references matches (id) on delete cascade,
+    idx integer not null,
+    actor actor not null,
+    action jsonb not null,
+    action_type varchar,
+    created_at timestamp with time zone not null default now(),
+    constraint turns_partitioned_pkey primary key (id, created_at)
+) partition by range (created_at);
+
+create table events (
+    id integer not null default nextval('events_id_seq'),
+    match_id integer not null
+        constraint events_match_id_matches_id_fk references matches (id) on delete cascade,
+    turn_id integer,
+    event_type varchar not null,
+    payload jsonb not null,
+    created_at timestamp with time zone not null default now(),
+    constraint events_partitioned_pkey primary key (id, created_at)
+) partition by range (created_at);
+
+create table state_snapshots (
+    id integer not null default nextval('state_snapshots_id_seq'),
+    match_id integer not null
+        constraint state_snapshots_match_id_matches_id_fk references matches (id) on delete cascade,
+    turn_id integer,
+    game_key varchar not null,
+    game_version varchar not null,
+    state jsonb not null,
+    created_at timestamp with time zone not null default now(),
+    constraint state_snapshots_partitioned_pkey primary key (id, created_at)
+) partition by range (created_at);
+
+alter sequence turns_id_seq owned by turns.id;
+alter sequence events_id_seq owned by events.id;
+alter sequence state_snapshots_id_seq owned by state_snapshots.id;
+
+create index turns_match_id_idx on turns (match_id);
+create index events_match_id_idx on events (match_id);
+create index state_snapshots_match_id_idx on state_snapshots (match_id);
+
+-- Monthly partitions from the oldest existing row through two months ahead
+do $$
+declare
+    tbl text;
+    month_start date;
+    last_month date := date_trunc('month', now() + interval '2 months')::date;
+begin
+    select date_trunc('month', coalesce(min(created_at), now()))::date into month_start from turns_legacy;
+    month_start := least(
+        month_start,
+        (select date_trunc('month', coalesce(min(created_at), now()))::date from events_legacy),
+        (select date_trunc('month', coalesce(min(created_at), now()))::date from state_snapshots_legacy)
+    );
+    while month_start <= last_month loop
+        foreach tbl in array array['turns', 'events', 'state_snapshots'] loop
+            execute format(
+                'create table %I partition of %I for values from (%L) to (%L)',
+                tbl || '_p' || to_char(month_start, 'YYYY_MM'),
+                tbl,
+                month_start,
+                (month_start + interval '1 month')::date
+            );
+        end loop;
+        month_start := (month_start + interval '1 month')::date;
+    end loop;
+end $$;
+
+create table turns_default partition of turns default;
+create table events_default partition of events default;
+create table state_snapshots_default partition of state_snapshots default;
+
+insert into turns (id, match_id, idx, actor, action, action_type, created_at)
+select id, match_id, idx, actor, action, action_type, created_at from turns_legacy;
+insert into events (id, match_id, turn_id, event_type, payload, created_at)
+select id, match_id, turn_id, event_type, payload, created_at from events_legacy;
+insert into state_snapshots (id, match_id, turn_id, game_key, game_version, state, created_at)
+select id, match_id, turn_id, game_key, game_version, state, created_at from state_snapshots_legacy;
+
+select setval('turns_id_seq', coalesce((select max(id) from turns), 0) + 1, false);
+select setval('events_id_seq', coalesce((select max(id) from events), 0) + 1, false);
+select setval('state_snapshots_id_seq', coalesce((select max(id) from state_snapshots), 0) + 1, false);
+
+drop table state_snapshots_legacy;
+drop table events_legacy;
+drop table turns_legacy;
+
+-- Sequences declared in the drizzle schema are not owned by the legacy tables
+drop sequence if exists state_snapshots_legacy_id_seq;
+drop sequence if exists events_legacy_id_seq;
+drop sequence if exists turns_legacy_id_seq;
+
+commit;
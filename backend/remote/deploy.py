@@ -17,7 +17,7 @@ def run_a_match(max_turns: int = 9):
     from lib.games.tictactoe.agents import RandomLegalAgent
     from lib.games.tictactoe.spec import TicTacToeGameSpec
 
-    agent_a = RandomLegalAgent("agentA")
-    agent_b = RandomLegalAgent("agentB")
+    agent_a = RandomLegalAgent("random")
+    agent_b = RandomLegalAgent("random")
     spec = TicTacToeGameSpec()
     return run_match(agent_a, agent_b, max_turns=max_turns, game=spec)
\ No newline at end of file
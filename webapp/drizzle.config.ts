@@ -6,6 +6,8 @@ export default defineConfig({
   // Point directly to your table definition files so changes are detected
   schema: "./src/server/db/**/*.ts",
   dialect: "postgresql",
+  // Monthly partitions are managed by the backend retention job, not by drizzle
+  tablesFilter: ["*", "!*_p[0-9][0-9][0-9][0-9]_[0-9][0-9]", "!*_default"],
   dbCredentials: {
     // Read from process.env to avoid path alias issues in the CLI
     url: env.DATABASE_URL,
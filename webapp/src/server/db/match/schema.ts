@@ -1,9 +1,12 @@
-import { relations } from "drizzle-orm";
+import { relations, sql } from "drizzle-orm";
 import {
+  index,
   integer,
   jsonb,
+  primaryKey,
   uniqueIndex,
   pgEnum,
+  pgSequence,
   pgTable,
   timestamp,
   varchar,
@@ -25,36 +28,73 @@ export const matches = pgTable("matches", {
   createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
   gameKey: varchar("game_key").notNull(),
   gameVersion: varchar("game_version").notNull(),
+  agentA: varchar("agent_a"),
+  agentB: varchar("agent_b"),
+  compactedAt: timestamp("compacted_at", { withTimezone: true }),
 });
 
-export const turns = pgTable("turns", {
-  id: integer("id").primaryKey().generatedAlwaysAsIdentity(),
-  matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
-  idx: integer("idx").notNull(),
-  actor: actorEnum("actor").notNull(),
-  action: jsonb("action").$type<unknown>().notNull(),
-  actionType: varchar("action_type"),
-  createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
-});
+// turns, events and state_snapshots are range-partitioned by month on created_at
+// (backend/migrations/0001_partition_history_tables.sql), so their primary keys
+// include created_at and ids come from plain sequences. The sequences are declared
+// here so `db:push` creates them before the column defaults that use them.
 
-export const events = pgTable("events", {
-  id: integer("id").primaryKey().generatedAlwaysAsIdentity(),
-  matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
-  turnId: integer("turn_id"),
-  eventType: varchar("event_type").notNull(),
-  payload: jsonb("payload").notNull(),
-  createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
-});
+// `as integer` sequences in the migration; matching maxValue keeps push from altering them
+const integerSequence = { maxValue: 2147483647 };
 
-export const stateSnapshots = pgTable("state_snapshots", {
-  id: integer("id").primaryKey().generatedAlwaysAsIdentity(),
-  matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
-  turnId: integer("turn_id").references(() => turns.id, { onDelete: "cascade" }),
-  gameKey: varchar("game_key").notNull(),
-  gameVersion: varchar("game_version").notNull(),
-  state: jsonb("state").$type<Record<string, unknown>>().notNull(),
-  createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
-});
+export const turnsIdSeq = pgSequence("turns_id_seq", integerSequence);
+export const eventsIdSeq = pgSequence("events_id_seq", integerSequence);
+export const stateSnapshotsIdSeq = pgSequence("state_snapshots_id_seq", integerSequence);
+
+export const turns = pgTable(
+  "turns",
+  {
+    id: integer("id").notNull().default(sql`nextval('turns_id_seq')`),
+    matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
+    idx: integer("idx").notNull(),
+    actor: actorEnum("actor").notNull(),
+    action: jsonb("action").$type<unknown>().notNull(),
+    actionType: varchar("action_type"),
+    createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
+  },
+  (t) => ({
+    pk: primaryKey({ name: "turns_partitioned_pkey", columns: [t.id, t.createdAt] }),
+    matchIdx: index("turns_match_id_idx").on(t.matchId),
+  }),
+);
+
+export const events = pgTable(
+  "events",
+  {
+    id: integer("id").notNull().default(sql`nextval('events_id_seq')`),
+    matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
+    turnId: integer("turn_id"),
+    eventType: varchar("event_type").notNull(),
+    payload: jsonb("payload").notNull(),
+    createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
+  },
+  (t) => ({
+    pk: primaryKey({ name: "events_partitioned_pkey", columns: [t.id, t.createdAt] }),
+    matchIdx: index("events_match_id_idx").on(t.matchId),
+  }),
+);
+
+export const stateSnapshots = pgTable(
+  "state_snapshots",
+  {
+    id: integer("id").notNull().default(sql`nextval('state_snapshots_id_seq')`),
+    matchId: integer("match_id").notNull().references(() => matches.id, { onDelete: "cascade" }),
+    // No foreign key: a partitioned turns table has no unique constraint on id alone
+    turnId: integer("turn_id"),
+    gameKey: varchar("game_key").notNull(),
+    gameVersion: varchar("game_version").notNull(),
+    state: jsonb("state").$type<Record<string, unknown>>().notNull(),
+    createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
+  },
+  (t) => ({
+    pk: primaryKey({ name: "state_snapshots_partitioned_pkey", columns: [t.id, t.createdAt] }),
+    matchIdx: index("state_snapshots_match_id_idx").on(t.matchId),
+  }),
+);
 
 export const matchesRelations = relations(matches, ({ many }) => ({
   turns: many(turns),
@@ -111,3 +151,51 @@ export const gameDefinitions = pgTable(
     ),
   }),
 );
+
+// Per-agent move statistics keyed by a symmetry-canonical position hash.
+// Maintained incrementally by the backend from finished matches.
+export const positionStats = pgTable(
+  "position_stats",
+  {
+    id: integer("id").primaryKey().generatedAlwaysAsIdentity(),
+    gameKey: varchar("game_key").notNull(),
+    gameVersion: varchar("game_version").notNull(),
+    positionHash: varchar("position_hash").notNull(),
+    agentName: varchar("agent_name").notNull(),
+    actionKey: varchar("action_key").notNull(),
+    action: jsonb("action").$type<unknown>().notNull(),
+    plays: integer("plays").notNull().default(0),
+    wins: integer("wins").notNull().default(0),
+    draws: integer("draws").notNull().default(0),
+    losses: integer("losses").notNull().default(0),
+    updatedAt: timestamp("updated_at", { withTimezone: true }).notNull().defaultNow(),
+  },
+  (t) => ({
+    positionAgentActionIdx: uniqueIndex("position_stats_position_agent_action_idx").on(
+      t.gameKey,
+      t.gameVersion,
+      t.positionHash,
+      t.agentName,
+      t.actionKey,
+    ),
+    positionIdx: index("position_stats_position_idx").on(t.gameKey, t.gameVersion, t.positionHash),
+  }),
+);
+
+export const positionIndexedMatches = pgTable("position_indexed_matches", {
+  matchId: integer("match_id")
+    .primaryKey()
+    .references(() => matches.id, { onDelete: "cascade" }),
+  indexedAt: timestamp("indexed_at", { withTimezone: true }).notNull().defaultNow(),
+});
+
+// Outcomes of fully deterministic matches, keyed by a hash of game, agents, configs and seed.
+// The backend orchestrator returns these instead of replaying identical matches.
+export const matchOutcomes = pgTable("match_outcomes", {
+  cacheKey: varchar("cache_key").primaryKey(),
+  matchId: integer("match_id")
+    .notNull()
+    .references(() => matches.id, { onDelete: "cascade" }),
+  result: jsonb("result").$type<Record<string, unknown>>().notNull(),
+  createdAt: timestamp("created_at", { withTimezone: true }).notNull().defaultNow(),
+});